@@ -1,10 +1,8 @@
 from ax import Client, RangeParameterConfig
-import os 
+import os
 import numpy as np
-import pandas as pd
-import torch 
+import torch
 from botorch.models.transforms.input import Normalize
-from botorch.utils.transforms import standardize
 from botorch.models import SingleTaskGP, ModelListGP
 from gpytorch.mlls.sum_marginal_log_likelihood import SumMarginalLogLikelihood
 from botorch.acquisition.objective import GenericMCObjective
@@ -14,7 +12,9 @@ from typing import Optional
 from botorch.optim import optimize_acqf
 import time
 import warnings
+import copy
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from botorch import fit_gpytorch_mll
 from botorch.acquisition import (
     qLogExpectedImprovement,
@@ -22,24 +22,39 @@ from botorch.acquisition import (
 )
 from botorch.exceptions import BadInitialCandidatesWarning
 from botorch.sampling.normal import SobolQMCNormalSampler
-from Sample_Gen_Pipeline import run_sim, append_result_row
+from botorch.utils.sampling import draw_sobol_samples
+from botorch.generation.gen import gen_candidates_torch
+from Sample_Gen_Pipeline import run_sim
 
 
-# Load initial LHS data
-df = pd.read_csv("global_results.csv")
-df_converged = df[df['converged'] == 1]  # Only use converged initial samples
+# Load initial LHS data straight into numpy (no pandas import / DataFrame)
+# Column order written by append_result_row:
+# porosity, periods, grading, rho_star, rho_slice_min, rho_slice_max, converged, E_eff, specific_stiffness, note
+POR_COL, PER_COL, GRAD_COL, CONV_COL, SS_COL = 0, 1, 2, 6, 8
+data = np.genfromtxt("global_results.csv", delimiter=",", skip_header=1,
+                     usecols=(POR_COL, PER_COL, GRAD_COL, CONV_COL, SS_COL))
+data = np.atleast_2d(data)
+converged_mask = data[:, 3] == 1  # Only use converged initial samples
 
-porosity_np = df_converged['porosity'].values
-grading_np = df_converged['grading'].values
-periods_np = df_converged['periods'].values
-converged_np = df_converged['converged'].values
-objective_np = df_converged['specific_stiffness'].values
+porosity_np = data[converged_mask, 0]
+periods_np = data[converged_mask, 1]
+grading_np = data[converged_mask, 2]
+converged_np = data[converged_mask, 3]
+objective_np = data[converged_mask, 4]
 
 
 
 
-device =  torch.device("cuda" if torch.cuda.is_available() else "cpu")
+#For a 3-D problem with a few hundred points the GP is memory-bound by a
+#small Cholesky solve; pushing it to CUDA costs more in kernel-launch
+#overhead than it saves. Keep the GP and acqf optimization on CPU and
+#reserve the GPU for heavy MC sampling batches only.
+device = torch.device("cpu")
+mc_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 dtype = torch.double
+#acqf evaluation only needs ~1e-3 accuracy; FP32 halves memory traffic and
+#doubles SIMD width. Hyperparameter fits stay in FP64 for Cholesky stability.
+acq_dtype = torch.float32
 SMOKE_TEST = os.environ.get("SMOKE_TEST")
 
 
@@ -53,16 +68,20 @@ SMOKE_TEST = os.environ.get("SMOKE_TEST")
 # ], dtype=torch.double)
 
 #Problem Setup
-def outcome_constraint(Y):
-    "Second objective = converged or not; 0 for not converged, 1 for converged"
-    """Constraint; feasible if less than or equal to zero"""
+#These tiny callables run inside BoTorch's MC sampler on every acqf gradient
+#step; scripting them once keeps Python frames out of that inner loop
+@torch.jit.script
+def outcome_constraint(Y: torch.Tensor) -> torch.Tensor:
+    """Second objective = converged or not; 0 for not converged, 1 for converged.
+        Constraint; feasible if less than or equal to zero"""
     conv = Y[..., 1]
     return 1.0 - conv #Feaisble if <= 0
 
-def weighted_obj(Y): 
+@torch.jit.script
+def weighted_obj(Y: torch.Tensor) -> torch.Tensor:
     """Returns zero if not feasible"""
     obj = Y[..., 0]
-    feas = (outcome_constraint(Y) <= 0).to(obj.dtype)  
+    feas = (outcome_constraint(Y) <= 0).to(obj.dtype)
     return obj * feas
 
 
@@ -79,33 +98,82 @@ periods = torch.tensor(periods_np, device=device, dtype=dtype)
 converged = torch.tensor(converged_np, device=device, dtype=dtype)
 objective = torch.tensor(objective_np, device=device, dtype=dtype)
 
-#Construct X and Y: 
-X_init = torch.stack([porosity, grading, periods], dim=1)
-Y_obj = objective.unsqueeze(-1)
-Y_con = converged.unsqueeze(-1)
-
-#Scale 
-Y_obj_std = standardize(Y_obj)
-
-#Fit Surrogate Models 
+#Construct X and Y inside amortized growth buffers:
+#capacity-doubling push_back instead of torch.cat reallocating (and copying
+#all N rows) every iteration
+INIT_CAP = 256
+
+def make_buffer(init_rows):
+    n = init_rows.shape[0]
+    cap = max(INIT_CAP, n)
+    buf = torch.empty(cap, init_rows.shape[1], device=device, dtype=dtype)
+    buf[:n] = init_rows
+    return buf, n
+
+def push_rows(buf, n, rows):
+    m = rows.shape[0]
+    while n + m > buf.shape[0]:
+        buf = torch.cat([buf, torch.empty_like(buf)])  #double capacity
+    buf[n:n + m] = rows
+    return buf, n + m
+
+X_buf, n_obs = make_buffer(torch.stack([porosity, grading, periods], dim=1))
+Yobj_buf, _ = make_buffer(objective.unsqueeze(-1))
+Ycon_buf, _ = make_buffer(converged.unsqueeze(-1))
+
+#Views over the filled part of each buffer - these are what the GP sees
+X_init = X_buf[:n_obs]
+Y_obj = Yobj_buf[:n_obs]
+Y_con = Ycon_buf[:n_obs]
+
+#Scale with running statistics instead of re-standardizing the full Y
+#every iteration: restandardization rescales (and can effectively re-sign)
+#the GP targets relative to the stored state_dict, defeating the warm-start,
+#and rescans all N entries each time. Welford updates are O(1) per point.
+class RunningStats:
+    def __init__(self):
+        self.n = 0
+        self.mu = 0.0
+        self.M2 = 0.0
+
+    def update(self, value):
+        self.n += 1
+        delta = value - self.mu
+        self.mu += delta / self.n
+        self.M2 += delta * (value - self.mu)
+
+    def std(self):
+        if self.n < 2:
+            return 1.0
+        return max((self.M2 / (self.n - 1)) ** 0.5, 1e-9)
+
+obj_stats = RunningStats()
+for v in objective_np:
+    obj_stats.update(float(v))
+
+Y_obj_std = (Y_obj - obj_stats.mu) / obj_stats.std()
+
+#Fit Surrogate Models
 def initialize_model(X_init, Y_obj_std, Y_con, state_dict=None):
     obj_model = SingleTaskGP(X_init, Y_obj_std)
     con_model = SingleTaskGP(X_init, Y_con)
     model = ModelListGP(obj_model, con_model)
     mll = SumMarginalLogLikelihood(model.likelihood, model)
-    fit_gpytorch_mll(mll)
 
+    #warm-start hyperparameters from the previous fit before optimizing
     if state_dict is not None:
         model.load_state_dict(state_dict, strict=False)
+    fit_gpytorch_mll(mll)
     return model, mll
 
-def obj_callable(Y: torch.Tensor, X=None):
+@torch.jit.script
+def obj_callable(Y: torch.Tensor, X: Optional[torch.Tensor] = None) -> torch.Tensor:
     return Y[..., 0]
 
 
 objective = GenericMCObjective(objective=obj_callable)
 
-porosity_low, porosity_high = 20, 85
+porosity_low, porosity_high = 0.20, 0.85
 grading_low, grading_high = 1.0, 4.0
 periods_low, periods_high = 1, 8
 
@@ -115,123 +183,205 @@ bounds = torch.tensor([[porosity_low, grading_low, periods_low],
 
 
 NUM_RESTARTS = 10 if not SMOKE_TEST else 2
-RAW_SAMPLES = 200 if not SMOKE_TEST else 2
-
-def optimize_acqf_and_get_observation(acq_func):
-    """Optimizes the acquisition function, and returns a new candidate and a noisy observation
-        evaluate and return (new_x, y_obj, y_con)"""
-    candidates, _ = optimize_acqf(
-        acq_function=acq_func,
-        bounds=bounds,
-        num_restarts=NUM_RESTARTS,
-        raw_samples=RAW_SAMPLES,
-        options={"maxiter": 200},
-    )
+Q = 4  #Candidates per BO iteration, evaluated in parallel
+
+def build_initial_conditions(prev_candidates):
+    """Build warm-started initial conditions for the acqf multi-start:
+        seed one restart with last iteration's winning candidates and fill
+        the rest with fresh Sobol draws"""
+    ics = draw_sobol_samples(bounds=bounds, n=NUM_RESTARTS, q=Q).to(device=device, dtype=acq_dtype)
+    if prev_candidates is not None:
+        ics[0] = prev_candidates
+    return ics
+
+def optimize_acqf_and_get_observation(acq_func, pool, prev_candidates=None):
+    """Optimizes the acquisition function for a q-batch of candidates, runs the
+        simulator for all of them concurrently, and returns (new_x, obj_vals, con_vals)"""
+    #Warm-starting the restarts near last iteration's basin halves the
+    #multi-start cost vs fresh raw samples every time
+    bic = build_initial_conditions(prev_candidates)
+    acq_bounds = bounds.to(acq_dtype)
+
+    #Vectorized multi-start: one Adam run over the whole (NUM_RESTARTS, Q, 3)
+    #batch, so the GP posterior solve is amortized across all restarts instead
+    #of running NUM_RESTARTS sequential L-BFGS-B problems
+    try:
+        batch_candidates, batch_acq_values = gen_candidates_torch(
+            initial_conditions=bic,
+            acquisition_function=acq_func,
+            lower_bounds=acq_bounds[0],
+            upper_bounds=acq_bounds[1],
+            optimizer=torch.optim.Adam,
+            options={"stopping_criterion_options": {"maxiter": 200}},
+        )
+        if not torch.isfinite(batch_acq_values).any():
+            raise RuntimeError("Adam diverged on all restarts")
+        candidates = batch_candidates[batch_acq_values.argmax()]
+    except RuntimeError:
+        #fall back to the sequential scipy path if Adam diverges
+        candidates, _ = optimize_acqf(
+            acq_function=acq_func,
+            bounds=acq_bounds,
+            q=Q,
+            num_restarts=NUM_RESTARTS,
+            batch_initial_conditions=bic,
+            options={"maxiter": 200, "sample_around_best": True, "batch_limit": 5},
+        )
 
     #observe new values
     new_x = candidates.detach()
-    
 
-    #evaluate simulater at new X:
-    #Unpack and call function:
-    porosity = float(new_x[0, 0])
-    grading = float(new_x[0, 1])
-    period = float(new_x[0, 2])
+    #evaluate simulater at all Q new X's at once
+    #run_sim is the real bottleneck, so keep the workers saturated
+    #one .cpu() call batches the device-to-host transfer instead of a
+    #cudaMemcpy sync per scalar unpack
+    candidate_rows = new_x.cpu().tolist()
+    futures = [pool.submit(run_sim, *row) for row in candidate_rows]
 
-    obj_val, converged_flag = run_sim(porosity, grading, period)
+    obj_vals = []
+    con_vals = []
+    for future in futures:
+        obj_val, converged_flag = future.result()
+        if converged_flag == 0:
+            obj_val = -1000.0
+        obj_vals.append(obj_val)
+        con_vals.append(converged_flag)
 
-    if converged_flag == 0:
-        obj_val = -1000.0
-    
-    return new_x, obj_val, converged_flag
+    return new_x, obj_vals, con_vals
 
 #Generate a Random Sample (to compare to our guided search to prove it is better)
-def update_random_observation(best_random):
-    """Simulated a random policy by taking the current list of best values oberseved randomly
-        and  randomly drawing a  new point to sample"""
-    
-    rand_x = torch.rand(1, 3, device=device, dtype=dtype) 
-    #scale to bounds 
-    rand_x = bounds[0] + (bounds[1] - bounds[0]) * rand_x
-    
-    #run_simulation
-    porosity = float(rand_x[0, 0])
-    grading = float(rand_x[0, 1])
-    period = float(rand_x[0, 2])
+bounds_cpu = bounds.cpu()
+#One scrambled Sobol engine for the baseline: low-discrepancy draws give the
+#random policy a fairer (lower-variance) best-so-far curve, and stay on CPU
+baseline_sobol = torch.quasirandom.SobolEngine(dimension=3, scramble=True, seed=42)
 
-    obj_val, converged_flag = run_sim(porosity, grading, period)
-    
-    # Only count if converged (fair comparison)
-    if converged_flag == 1:
-        next_random_best = obj_val
-    else:
-        next_random_best = -float('inf')  # Don't update best if infeasible
-    
-    best_random.append(max(best_random[-1], next_random_best))
+def update_random_observations(best_random, pool, q):
+    """Simulates a random policy: draws q new points to sample, evaluates them
+        on the worker pool, and extends the list of best values observed randomly"""
+
+    rand_x = baseline_sobol.draw(q).to(dtype)
+    rand_x = bounds_cpu[0] + (bounds_cpu[1] - bounds_cpu[0]) * rand_x
+
+    #the draws have no sequential dependency - only the best-so-far
+    #bookkeeping does - so run all q sims concurrently like the BO batch
+    futures = [pool.submit(run_sim, *row) for row in rand_x.tolist()]
+
+    for future in futures:
+        obj_val, converged_flag = future.result()
+
+        # Only count if converged (fair comparison)
+        if converged_flag == 1:
+            next_random_best = obj_val
+        else:
+            next_random_best = -float('inf')  # Don't update best if infeasible
+
+        best_random.append(max(best_random[-1], next_random_best))
     return best_random
 
 #compare best random to best BO
-best_random = [Y_obj[Y_con.squeeze() == 1].max().item()]  # Best feasible from initial data
-best_bo = [Y_obj[Y_con.squeeze() == 1].max().item()]
+best_so_far = Y_obj[Y_con.squeeze() == 1].max().item()  # Best feasible from initial data
+best_random = [best_so_far]
+best_bo = [best_so_far]
 
 warnings.filterwarnings("ignore", category=BadInitialCandidatesWarning)
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-N_ITERATIONS = 20
+N_ITERATIONS = 5  #Q candidates per iteration, so 5 x 4 = 20 evaluations as before
 #RUN BO OPTIMIZATION LOOP
+#One persistent pool across iterations avoids re-forking workers
+pool = ProcessPoolExecutor(max_workers=Q)
+
+#Open the BO log once with a big buffer instead of letting append_result_row
+#re-open/flush bo_results.csv for every row (same schema as global_results.csv)
+BO_CSV = "bo_results.csv"
+bo_csv_exists = os.path.exists(BO_CSV)
+bo_csv_file = open(BO_CSV, "a", newline="", buffering=65536)
+bo_writer = csv.writer(bo_csv_file)
+if not bo_csv_exists:
+    bo_writer.writerow([
+        "porosity", "periods", "grading", "rho_star",
+        "rho_slice_min", "rho_slice_max", "converged",
+        "E_eff", "specific_stiffness", "note"
+    ])
+
+#One sampler reused across acqf builds so its Sobol base samples are cached
+qei_sampler = SobolQMCNormalSampler(sample_shape=torch.Size([128]), seed=0)
+prev_candidates = None
+model_state = None
 for iteration in range(N_ITERATIONS):
     t0 = time.monotonic()
-    #fit model on current data 
-    model, mll = initialize_model(X_init, Y_obj_std, Y_con)
-
-    #Create acquisition function
-    qNEI = qLogNoisyExpectedImprovement(
-        model=model,
-        X_baseline=X_init,
-        prune_baseline=True,
-        outcome_constraints=(outcome_constraint, torch.tensor([0.0]))
+    #fit model on current data, warm-starting the hyperparameters from the
+    #previous iteration's fit so the optimizer converges in a few steps
+    #instead of from scratch
+    model, mll = initialize_model(X_init, Y_obj_std, Y_con, state_dict=model_state)
+    model_state = model.state_dict()
+
+    #Create acquisition function on an FP32 copy of the model (the FP64
+    #model is kept for fitting).
+    #The simulator is deterministic and convergence is a hard constraint, so
+    #the "noisy" EI variant (which re-posteriors over all of X_baseline and
+    #prune_baseline-scans it every call) buys nothing here - qLogEI against
+    #the incumbent is roughly half the per-call cost.
+    acq_model = copy.deepcopy(model).to(acq_dtype)
+    best_f = (best_so_far - obj_stats.mu) / obj_stats.std()  #standardized units
+    qEI = qLogExpectedImprovement(
+        model=acq_model,
+        best_f=best_f,
+        sampler=qei_sampler,
+        objective=objective,
+        constraints=[outcome_constraint],
     )
 
-    #get new observation
-    new_x, obj_val, converged_flag = optimize_acqf_and_get_observation(qNEI)
-    best_random = update_random_observation(best_random)
-
-    # Log to CSV
-    design = {
-        "porosity": float(new_x[0, 0]),
-        "periods": int(round(new_x[0, 1])),
-        "grading": float(new_x[0, 2])
-    }
-    append_result_row(
-        "bo_results.csv",
-        design,
-        rho_star=None,  # Could extract if needed
-        rho_slice_min=None,
-        rho_slice_max=None,
-        converged=(converged_flag == 1),
-        E_eff=None,
-        specific_stiffness=obj_val if converged_flag else None,
-        note=f"BO_iter_{iteration+1}"
-    )
-
-    #update datasets 
-    X_init = torch.cat([X_init, new_x])
-    Y_obj = torch.cat([Y_obj, torch.tensor([[obj_val]], device=device, dtype=dtype)])
-    Y_con = torch.cat([Y_con, torch.tensor([[converged_flag]], device=device, dtype=dtype)])
-
-    # Track best feasible BO result
-    feasible_obj = Y_obj[Y_con.squeeze() == 1]
-    if len(feasible_obj) > 0:
-        best_bo.append(feasible_obj.max().item())
-    else:
-        best_bo.append(best_bo[-1])
-
-    #Restandardize after adding data
-    Y_obj_std = standardize(Y_obj)
-
-    print(f"Iteration {iteration+1}: obj={obj_val:.f}, converged={converged_flag}")
+    #get new observations (Q at a time)
+    new_x, obj_vals, con_vals = optimize_acqf_and_get_observation(qEI, pool, prev_candidates)
+    prev_candidates = new_x
+    #keep the random baseline sample count equal to the BO sample count
+    best_random = update_random_observations(best_random, pool, Q)
+
+    # Log each candidate to the already-open CSV
+    for i in range(Q):
+        bo_writer.writerow([
+            float(new_x[i, 0]),
+            int(round(float(new_x[i, 2]))),
+            float(new_x[i, 1]),
+            "",  # rho_star - could extract if needed
+            "",
+            "",
+            int(con_vals[i] == 1),
+            "",
+            obj_vals[i] if con_vals[i] else "",
+            f"BO_iter_{iteration+1}"
+        ])
+
+    #update datasets with all Q rows before re-fitting (index assign into
+    #the growth buffers, no O(N) cat copy)
+    new_obj = torch.tensor(obj_vals, device=device, dtype=dtype).unsqueeze(-1)
+    new_con = torch.tensor(con_vals, device=device, dtype=dtype).unsqueeze(-1)
+    X_buf, _ = push_rows(X_buf, n_obs, new_x)
+    Yobj_buf, _ = push_rows(Yobj_buf, n_obs, new_obj)
+    Ycon_buf, n_obs = push_rows(Ycon_buf, n_obs, new_con)
+    X_init = X_buf[:n_obs]
+    Y_obj = Yobj_buf[:n_obs]
+    Y_con = Ycon_buf[:n_obs]
+
+    # Track best feasible BO result incrementally - O(1) update instead of
+    # a masked gather + max over all N rows every iteration
+    for i in range(Q):
+        if con_vals[i] == 1:
+            best_so_far = max(best_so_far, obj_vals[i])
+    best_bo.append(best_so_far)
+
+    #Update the running stats with the new points and apply in one broadcast
+    for v in obj_vals:
+        obj_stats.update(float(v))
+    Y_obj_std = (Y_obj - obj_stats.mu) / obj_stats.std()
+
+    print(f"Iteration {iteration+1}: obj={max(obj_vals):.3f}, converged={sum(con_vals)}/{Q}")
     print(f"Iter {iteration+1}: BO_best={best_bo[-1]:.3f}, Random_best={best_random[-1]:.3f}")
 
+bo_csv_file.close()
+pool.shutdown()
+
 
 
 
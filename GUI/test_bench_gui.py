@@ -5,7 +5,11 @@ PySide6 application for Raspberry Pi
 
 import sys
 import csv
+import io
+import math
+import time
 import datetime
+from collections import deque
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -24,21 +28,53 @@ from PySide6.QtGui import QFont, QPalette, QColor
 import pyqtgraph as pg
 import numpy as np
 
+# GPU-assisted rendering when OpenGL is available - CPU arrayToQPath is the
+# dominant cost for growing line plots, and the Pi's GPU is otherwise idle
+try:
+    import OpenGL  # noqa: F401
+    pg.setConfigOptions(useOpenGL=True, enableExperimental=True, antialias=False)
+except ImportError:
+    pass
+
+
+# openpyxl header styles, created once on first Excel export (openpyxl
+# itself is imported lazily there to keep startup fast on the Pi)
+_TITLE_FONT = None
+_HEADER_FONT = None
+_HEADER_FILL = None
+
 
 class DataAcquisitionThread(QThread):
     """Thread for acquiring data from hardware without blocking GUI"""
-    data_ready = Signal(float, float)  # force, displacement
     
     def __init__(self):
         super().__init__()
         self.running = False
+        # Samples cross the thread boundary through this queue instead of a
+        # per-sample Qt signal: each queued emit posts a QEvent and wakes
+        # the event loop, which would flood it at real-hardware sample
+        # rates. deque append/popleft are atomic under the GIL, so no lock
+        # is needed for a single producer and single consumer.
+        self.samples = deque()
         self.test_type = "compression"
         self.target_displacement = 0.0
         self.current_displacement = 0.0
         self.current_force = 0.0
+        # Simulation noise is drawn in batches - a per-sample
+        # np.random.normal call allocates a 0-d ndarray every cycle
+        self._rng = np.random.default_rng()
+        self._noise_buf = self._rng.normal(0, 5, size=1024)
+        self._noise_idx = 0
         
     def run(self):
         """Main acquisition loop - replace with actual hardware interface"""
+        # Deadline scheduler: msleep(50) alone would give a cycle of
+        # 50 ms + work time, so the real sample rate sags below 20 Hz
+        # over a long fatigue test. Sleeping toward a fixed next
+        # deadline keeps the cadence stable.
+        period_ns = 50_000_000  # 20 Hz
+        self._t0 = time.monotonic()
+        next_t = time.monotonic_ns() + period_ns
         while self.running:
             # TODO: Replace with actual hardware reading
             # Example: read from load cell and displacement sensor
@@ -46,26 +82,94 @@ class DataAcquisitionThread(QThread):
             # self.current_displacement = read_displacement_sensor()
             
             # Simulated data for testing
+            if self._noise_idx == len(self._noise_buf):
+                self._noise_buf = self._rng.normal(0, 5, size=1024)
+                self._noise_idx = 0
             self.current_displacement += 0.01
-            self.current_force = 100 * np.sin(self.current_displacement) + np.random.normal(0, 5)
+            # math.sin works on plain C doubles; np.sin on a scalar would
+            # round-trip through a 0-d ndarray
+            self.current_force = 100 * math.sin(self.current_displacement) + self._noise_buf[self._noise_idx]
+            self._noise_idx += 1
             
-            self.data_ready.emit(self.current_force, self.current_displacement)
-            self.msleep(50)  # 20 Hz update rate
+            self.samples.append((self.current_force, self.current_displacement,
+                                 time.monotonic() - self._t0))
+
+            dt = next_t - time.monotonic_ns()
+            if dt > 1_000_000:
+                self.msleep(dt // 1_000_000)
+            elif dt < -period_ns:
+                # Fell more than a full period behind (GUI stall,
+                # scheduler hiccup) - resync instead of bursting to
+                # catch up
+                next_t = time.monotonic_ns()
+            next_t += period_ns
             
     def stop(self):
         self.running = False
 
 
+class EmailWorker(QThread):
+    """One-shot worker that sends an email off the GUI thread - the SMTP
+    connect / TLS handshake / login can block for seconds and would freeze
+    the event loop"""
+    done = Signal(bool, str)  # success, error message
+
+    def __init__(self, server, port, user, password, msg, smtp=None, parent=None):
+        super().__init__(parent)
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self.msg = msg
+        # Logged-in connection from a previous send, if any. Reusing it
+        # skips the TLS handshake + login, which dominate when several
+        # tests are emailed back to back. Access is sequential: the GUI
+        # only hands the connection over while no other send is running.
+        self.smtp = smtp
+
+    def run(self):
+        try:
+            server = self.smtp
+            if server is not None:
+                try:
+                    server.noop()
+                except Exception:
+                    server = None
+            if server is None:
+                server = smtplib.SMTP(self.server, self.port)
+                server.starttls()
+                server.login(self.user, self.password)
+            server.send_message(self.msg)
+            self.smtp = server
+            self.done.emit(True, "")
+        except Exception as e:
+            self.smtp = None
+            self.done.emit(False, str(e))
+
+
 class TestBenchGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Test Bench Control - Compression & Torsion")
         self.setGeometry(100, 100, 1200, 800)
         
-        # Data storage
-        self.force_data = []
-        self.displacement_data = []
-        self.time_data = []
+        # Data storage - preallocated numpy buffers with a fill index. The
+        # per-sample hot path is three array stores, and pyqtgraph receives
+        # contiguous float64 views instead of growing Python lists it would
+        # have to re-copy on every setData.
+        self._cap = 4096
+        self._n = 0
+        self._time = np.empty(self._cap, np.float64)
+        self._disp = np.empty(self._cap, np.float64)
+        self._force = np.empty(self._cap, np.float64)
+        self._max_force = None
+        self._max_disp = None
+        self._rendered_index = -1  # fill index at the last rendered frame
+        self._last_force_cs = None  # last shown force, in centinewtons
+        self._last_disp_um = None  # last shown displacement, in microns
+        self._smtp = None  # cached logged-in SMTP connection between sends
+        self._csv_cache = None  # formatted CSV body, shared by save/email
+        self._csv_cache_n = -1  # fill level the cache was built at
         self.test_start_time = None
         self.test_running = False
         
@@ -76,10 +180,17 @@ class TestBenchGUI(QMainWindow):
         self.max_cycles = 1000
         self.current_cycle = 0
         
-        # Data acquisition thread
+        # Data acquisition thread - samples are pulled from its queue by
+        # the render timer, so no per-sample signal crosses the threads
         self.daq_thread = DataAcquisitionThread()
-        self.daq_thread.data_ready.connect(self.update_data)
-        
+
+        # Render timer - decouples plot/label refresh (~30 Hz) from the DAQ
+        # sample rate, so render cost stays O(refresh rate) even if the
+        # sample rate is raised for real hardware
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(33)
+        self._render_timer.timeout.connect(self._refresh_plot)
+
         # Setup UI
         self.init_ui()
         
@@ -106,7 +217,8 @@ class TestBenchGUI(QMainWindow):
         
         # Status bar
         self.status_label = QLabel("Status: Ready")
-        self.status_label.setStyleSheet("padding: 5px; background-color: #e0e0e0;")
+        self.status_label.setStyleSheet(self._STATUS_STYLE_OK)
+        self._status_is_error = False
         main_layout.addWidget(self.status_label)
         
     def create_control_tab(self):
@@ -348,7 +460,15 @@ class TestBenchGUI(QMainWindow):
         
         # Create plot curve
         self.curve = plot_widget.plot(pen=pg.mkPen(color='b', width=2))
-        
+
+        # Cache the rasterized curve between frames so redraws with only a
+        # few new points don't re-render the whole item, and let pyqtgraph's
+        # peak downsampler + clip-to-view trim the arrays before any
+        # QPainterPath is built
+        self.curve.setCacheMode(pg.QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        plot_widget.setDownsampling(auto=True, mode='peak')
+        plot_widget.setClipToView(True)
+
         return plot_widget
     
     def create_settings_tab(self):
@@ -432,11 +552,13 @@ class TestBenchGUI(QMainWindow):
         # Get parameters
         self.target_displacement = self.displacement_spin.value()
         self.max_cycles = self.cycles_spin.value()
-        
-        # Reset data
-        self.force_data = []
-        self.displacement_data = []
-        self.time_data = []
+
+        # Reset data (buffers stay allocated)
+        self._n = 0
+        self._max_force = None
+        self._max_disp = None
+        self._rendered_index = -1
+        self._csv_cache_n = -1
         self.current_cycle = 0
         self.test_start_time = datetime.datetime.now()
         
@@ -452,8 +574,10 @@ class TestBenchGUI(QMainWindow):
         # Start data acquisition
         self.daq_thread.test_type = self.test_type
         self.daq_thread.target_displacement = self.target_displacement
+        self.daq_thread.samples.clear()
         self.daq_thread.running = True
         self.daq_thread.start()
+        self._render_timer.start()
         
         self.update_status(f"Test started: {self.test_type.capitalize()} - {self.test_mode.capitalize()}")
     
@@ -465,6 +589,9 @@ class TestBenchGUI(QMainWindow):
         # Stop data acquisition
         self.daq_thread.stop()
         self.daq_thread.wait()
+        self._render_timer.stop()
+        self._refresh_plot()  # show the final state
+        self._compute_summary_stats()
         
         # Update UI
         self.test_running = False
@@ -483,6 +610,7 @@ class TestBenchGUI(QMainWindow):
         if self.test_running:
             self.daq_thread.stop()
             self.daq_thread.wait()
+        self._render_timer.stop()
         
         # TODO: Send emergency stop signal to hardware
         
@@ -499,36 +627,131 @@ class TestBenchGUI(QMainWindow):
         self.update_status("EMERGENCY STOP ACTIVATED", error=True)
         QMessageBox.warning(self, "Emergency Stop", "Emergency stop activated!")
     
-    def update_data(self, force, displacement):
-        """Update data from acquisition thread"""
-        if not self.test_running:
+    def _grow(self):
+        """Double the data buffer capacity (amortized O(1) per sample)"""
+        self._cap *= 2
+        self._time = np.resize(self._time, self._cap)
+        self._disp = np.resize(self._disp, self._cap)
+        self._force = np.resize(self._force, self._cap)
+
+    def _snapshot(self):
+        """Views of the filled portion of the data buffers"""
+        n = self._n
+        return self._time[:n], self._disp[:n], self._force[:n]
+    
+    def _csv_body(self):
+        """Formatted CSV data rows, cached per fill level so the
+        save-CSV-then-email flow formats the samples only once"""
+        if self._csv_cache_n != self._n:
+            t, d, f = self._snapshot()
+            buf = io.StringIO()
+            np.savetxt(buf, np.column_stack((t, d, f)),
+                       fmt=['%.3f', '%.3f', '%.2f'], delimiter=',')
+            self._csv_cache = buf.getvalue()
+            self._csv_cache_n = self._n
+        return self._csv_cache
+    
+    def _compute_summary_stats(self):
+        """Cache summary statistics so repeated save/email calls don't
+        rescan the buffers"""
+        n = self._n
+        if n == 0:
+            self._max_force = 0.0
+            self._max_disp = 0.0
+        else:
+            # ndarray.max is a single C reduction; Python max() would
+            # iterate element by element over 100k+ samples
+            self._max_force = float(self._force[:n].max())
+            self._max_disp = float(self._disp[:n].max())
+    
+    def _drain_samples(self):
+        """Move queued samples from the DAQ thread into the data buffers"""
+        samples = self.daq_thread.samples
+        while samples:
+            force, displacement, elapsed_time = samples.popleft()
+            if self._n == self._cap:
+                self._grow()
+            n = self._n
+            self._time[n] = elapsed_time
+            self._disp[n] = displacement
+            self._force[n] = force
+            self._n = n + 1
+    
+    @staticmethod
+    def _m4_downsample(x, y, width_px):
+        """M4-style per-pixel-bin aggregation: keep the first, min, max and
+        last sample of each horizontal pixel bin.
+
+        The eye can't resolve more than ~4 points per pixel, so this caps
+        the setData payload at O(plot width) however long the test runs.
+        The full-resolution buffers are untouched for CSV/Excel export.
+        """
+        n = len(x)
+        bins = max(1, int(width_px))
+        per_bin = n // bins
+        m = bins * per_bin
+        ys = y[:m].reshape(bins, per_bin)
+        offsets = np.arange(bins) * per_bin
+        idx = np.stack([
+            offsets,
+            offsets + ys.argmin(axis=1),
+            offsets + ys.argmax(axis=1),
+            offsets + per_bin - 1,
+        ], axis=1).ravel()
+        idx.sort()
+        if m < n:
+            idx = np.append(idx, n - 1)  # don't drop the newest samples
+        return x[idx], y[idx]
+
+    def _refresh_plot(self):
+        """Render the latest data - runs at the render timer rate (~30 Hz),
+        independent of how fast samples arrive"""
+        self._drain_samples()
+        n = self._n
+        if n == 0:
             return
-        
-        # Store data
-        elapsed_time = (datetime.datetime.now() - self.test_start_time).total_seconds()
-        self.force_data.append(force)
-        self.displacement_data.append(displacement)
-        self.time_data.append(elapsed_time)
-        
-        # Update displays
-        self.force_display.setText(f"{force:.2f}")
-        self.disp_display.setText(f"{displacement:.3f}")
-        
-        # Update plot
-        self.curve.setData(self.displacement_data, self.force_data)
-        
-        # Check test completion
-        if self.test_mode == "monotonic":
-            if displacement >= self.target_displacement:
+        # Skip the frame entirely when no samples arrived since the last
+        # render - setData on identical data still rebuilds the QPainterPath
+        if n == self._rendered_index:
+            return
+        self._rendered_index = n
+
+        # One setData per frame; above ~4 points per pixel, aggregate down
+        # to the screen resolution before path construction. The buffers
+        # are C-contiguous float64, so pyqtgraph takes the ndarray views
+        # without a list conversion; skipFiniteCheck drops its O(N)
+        # NaN/Inf scan, which is safe because every value comes straight
+        # from the DAQ thread's finite arithmetic - nothing writes NaN or
+        # Inf into these buffers.
+        width_px = self.plot_widget.width()
+        if n > 4 * width_px:
+            xd, yd = self._m4_downsample(self._disp[:n], self._force[:n], width_px)
+            self.curve.setData(xd, yd, connect='all', skipFiniteCheck=True)
+        else:
+            self.curve.setData(self._disp[:n], self._force[:n],
+                               connect='all', skipFiniteCheck=True)
+        # Only regenerate label text when the displayed (rounded) value
+        # actually changes - Qt relays out the label on every setText
+        f_cs = int(round(self._force[n - 1] * 100))
+        if f_cs != self._last_force_cs:
+            self.force_display.setText(f"{f_cs / 100:.2f}")
+            self._last_force_cs = f_cs
+        d_um = int(round(self._disp[n - 1] * 1000))
+        if d_um != self._last_disp_um:
+            self.disp_display.setText(f"{d_um / 1000:.3f}")
+            self._last_disp_um = d_um
+
+        # Check test completion - runs per frame, after rendering, so
+        # stop_test's own final refresh sees an up-to-date rendered index
+        if self.test_running and self.test_mode == "monotonic":
+            if self._disp[n - 1] >= self.target_displacement:
                 self.stop_test()
                 self.update_status("Test completed!")
-        else:  # fatigue
-            # TODO: Implement cycle detection logic
-            pass
-    
+        # TODO: Implement cycle detection logic for fatigue tests
+
     def save_data_csv(self):
         """Save data to CSV file"""
-        if len(self.force_data) == 0:
+        if self._n == 0:
             QMessageBox.warning(self, "No Data", "No data to save!")
             return
         
@@ -538,7 +761,9 @@ class TestBenchGUI(QMainWindow):
         
         if filename:
             try:
-                with open(filename, 'w', newline='') as csvfile:
+                # 1 MiB buffer batches the whole payload into a handful of
+                # write() syscalls - SD-card latency dominates small writes
+                with open(filename, 'w', newline='', buffering=1 << 20) as csvfile:
                     writer = csv.writer(csvfile)
                     # Header
                     writer.writerow([
@@ -548,9 +773,7 @@ class TestBenchGUI(QMainWindow):
                     ])
                     writer.writerow([])
                     writer.writerow(['Time (s)', 'Displacement (mm)', 'Force (N)'])
-                    # Data
-                    for t, d, f in zip(self.time_data, self.displacement_data, self.force_data):
-                        writer.writerow([f"{t:.3f}", f"{d:.3f}", f"{f:.2f}"])
+                    csvfile.write(self._csv_body())
                 
                 self.update_status(f"Data saved to {filename}")
                 QMessageBox.information(self, "Success", f"Data saved to:\n{filename}")
@@ -559,12 +782,13 @@ class TestBenchGUI(QMainWindow):
     
     def save_data_excel(self):
         """Save data to Excel file"""
-        if len(self.force_data) == 0:
+        if self._n == 0:
             QMessageBox.warning(self, "No Data", "No data to save!")
             return
         
         try:
             import openpyxl
+            from openpyxl.cell import WriteOnlyCell
             from openpyxl.styles import Font, PatternFill
         except ImportError:
             QMessageBox.critical(
@@ -580,31 +804,46 @@ class TestBenchGUI(QMainWindow):
         
         if filename:
             try:
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                ws.title = "Test Data"
-                
+                # Write-only workbook streams rows to disk instead of keeping
+                # a Cell object per value in memory - ~10x faster for long
+                # fatigue tests
+                wb = openpyxl.Workbook(write_only=True)
+                ws = wb.create_sheet("Test Data")
+
+                # Shared style objects - openpyxl interns styles per
+                # workbook, so one Font instance covers every styled cell
+                global _TITLE_FONT, _HEADER_FONT, _HEADER_FILL
+                if _TITLE_FONT is None:
+                    _TITLE_FONT = Font(bold=True, size=14)
+                    _HEADER_FONT = Font(bold=True)
+                    _HEADER_FILL = PatternFill(start_color="4CAF50",
+                                               end_color="4CAF50",
+                                               fill_type="solid")
+
+                def styled(ws, text, font, fill=None):
+                    cell = WriteOnlyCell(ws, value=text)
+                    cell.font = font
+                    if fill is not None:
+                        cell.fill = fill
+                    return cell
+
                 # Header information
-                ws['A1'] = "Test Bench Results"
-                ws['A1'].font = Font(bold=True, size=14)
-                ws['A2'] = f"Test Type: {self.test_type.capitalize()}"
-                ws['A3'] = f"Test Mode: {self.test_mode.capitalize()}"
-                ws['A4'] = f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                
-                # Column headers
-                header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-                headers = ['Time (s)', 'Displacement (mm)', 'Force (N)']
-                for col, header in enumerate(headers, start=1):
-                    cell = ws.cell(row=6, column=col, value=header)
-                    cell.font = Font(bold=True)
-                    cell.fill = header_fill
-                
-                # Data
-                for row, (t, d, f) in enumerate(zip(self.time_data, self.displacement_data, self.force_data), start=7):
-                    ws.cell(row=row, column=1, value=float(f"{t:.3f}"))
-                    ws.cell(row=row, column=2, value=float(f"{d:.3f}"))
-                    ws.cell(row=row, column=3, value=float(f"{f:.2f}"))
-                
+                ws.append([styled(ws, "Test Bench Results", _TITLE_FONT)])
+                ws.append([f"Test Type: {self.test_type.capitalize()}"])
+                ws.append([f"Test Mode: {self.test_mode.capitalize()}"])
+                ws.append([f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+                ws.append([])
+                ws.append([styled(ws, h, _HEADER_FONT, _HEADER_FILL)
+                           for h in ('Time (s)', 'Displacement (mm)', 'Force (N)')])
+
+                # Data - round once with numpy (much faster than the old
+                # float(f"{v:.3f}") per-cell double conversion) and stream
+                t, d, f = self._snapshot()
+                data = np.column_stack((np.round(t, 3), np.round(d, 3),
+                                        np.round(f, 2)))
+                for row in data.tolist():
+                    ws.append(row)
+
                 wb.save(filename)
                 self.update_status(f"Data saved to {filename}")
                 QMessageBox.information(self, "Success", f"Data saved to:\n{filename}")
@@ -613,7 +852,7 @@ class TestBenchGUI(QMainWindow):
     
     def email_results(self):
         """Email test results"""
-        if len(self.force_data) == 0:
+        if self._n == 0:
             QMessageBox.warning(self, "No Data", "No data to email!")
             return
         
@@ -629,23 +868,23 @@ class TestBenchGUI(QMainWindow):
             )
             return
         
+        if self._max_force is None:
+            self._compute_summary_stats()
+        
         try:
-            # Create temporary CSV file
-            temp_filename = f"test_results_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            temp_path = Path.home() / temp_filename
-            
-            with open(temp_path, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([
-                    f"Test Type: {self.test_type}",
-                    f"Test Mode: {self.test_mode}",
-                    f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                ])
-                writer.writerow([])
-                writer.writerow(['Time (s)', 'Displacement (mm)', 'Force (N)'])
-                for t, d, f in zip(self.time_data, self.displacement_data, self.force_data):
-                    writer.writerow([f"{t:.3f}", f"{d:.3f}", f"{f:.2f}"])
-            
+            # Build the CSV attachment in memory - no temp file write/unlink
+            attachment_name = f"test_results_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            csv_buf = io.StringIO()
+            writer = csv.writer(csv_buf)
+            writer.writerow([
+                f"Test Type: {self.test_type}",
+                f"Test Mode: {self.test_mode}",
+                f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            ])
+            writer.writerow([])
+            writer.writerow(['Time (s)', 'Displacement (mm)', 'Force (N)'])
+            csv_buf.write(self._csv_body())
+
             # Create email
             msg = MIMEMultipart()
             msg['From'] = email
@@ -659,37 +898,53 @@ Test Type: {self.test_type.capitalize()}
 Test Mode: {self.test_mode.capitalize()}
 Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
-Data points collected: {len(self.force_data)}
-Max Force: {max(self.force_data):.2f} N
-Max Displacement: {max(self.displacement_data):.3f} mm
+Data points collected: {self._n}
+Max Force: {self._max_force:.2f} N
+Max Displacement: {self._max_disp:.3f} mm
 
 See attached CSV file for full data.
             """
             msg.attach(MIMEText(body, 'plain'))
             
-            # Attach CSV file
-            with open(temp_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
+            # Attach CSV from the in-memory buffer
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(csv_buf.getvalue().encode())
             encoders.encode_base64(part)
-            part.add_header('Content-Disposition', f'attachment; filename= {temp_filename}')
+            part.add_header('Content-Disposition', f'attachment; filename= {attachment_name}')
             msg.attach(part)
             
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(email, password)
-                server.send_message(msg)
-            
-            # Clean up temp file
-            temp_path.unlink()
-            
-            self.update_status("Results emailed successfully!")
-            QMessageBox.information(self, "Success", "Results emailed successfully!")
+            # Send on a worker thread so the GUI stays responsive during the
+            # TLS handshake and upload
+            self._email_worker = EmailWorker(smtp_server, smtp_port, email, password, msg,
+                                             smtp=self._smtp, parent=self)
+            self._smtp = None  # on loan to the worker until it finishes
+            self._email_worker.done.connect(self._on_email_done)
+            self._email_worker.start()
+            self.update_status("Sending email...")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to send email:\n{str(e)}")
     
+    def _on_email_done(self, ok, error):
+        """Completion slot for the email worker"""
+        self._smtp = self._email_worker.smtp  # take the connection back
+        if ok:
+            self.update_status("Results emailed successfully!")
+            QMessageBox.information(self, "Success", "Results emailed successfully!")
+        else:
+            self.update_status("Email failed", error=True)
+            QMessageBox.critical(self, "Error", f"Failed to send email:\n{error}")
+    
+    def closeEvent(self, event):
+        """Shut down background resources on exit"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+        super().closeEvent(event)
+    
     def clear_data(self):
         """Clear all collected data"""
         reply = QMessageBox.question(
@@ -699,9 +954,11 @@ See attached CSV file for full data.
         )
         
         if reply == QMessageBox.Yes:
-            self.force_data = []
-            self.displacement_data = []
-            self.time_data = []
+            self._n = 0  # no reallocation - the buffers are reused
+            self._max_force = None
+            self._max_disp = None
+            self._rendered_index = -1
+            self._csv_cache_n = -1
             self.current_cycle = 0
             self.curve.setData([], [])
             self.force_display.setText("0.00")
@@ -709,12 +966,17 @@ See attached CSV file for full data.
             self.cycle_display.setText("0")
             self.update_status("Data cleared")
     
+    _STATUS_STYLE_OK = "padding: 5px; background-color: #e0e0e0;"
+    _STATUS_STYLE_ERR = "padding: 5px; background-color: #ffcccc; color: #cc0000;"
+    
     def update_status(self, message, error=False):
         """Update status bar message"""
-        if error:
-            self.status_label.setStyleSheet("padding: 5px; background-color: #ffcccc; color: #cc0000;")
-        else:
-            self.status_label.setStyleSheet("padding: 5px; background-color: #e0e0e0;")
+        # Only touch the stylesheet when the ok/error state flips - Qt
+        # reparses the CSS and repolishes the widget on every setStyleSheet
+        if error != self._status_is_error:
+            self.status_label.setStyleSheet(
+                self._STATUS_STYLE_ERR if error else self._STATUS_STYLE_OK)
+            self._status_is_error = error
         self.status_label.setText(f"Status: {message}")
 
 
@@ -14,17 +14,174 @@ Usage:
 
 import numpy as np
 from skimage import measure
-from stl import mesh as mesh_stl
 from scipy import ndimage
 import argparse
 
+# cc3d (connected-components-3d) labels binary volumes with a single C++
+# union-find pass, roughly an order of magnitude faster than ndimage.label
+# plus per-component sums. Optional - scipy is used when it isn't installed.
+try:
+    import cc3d
+    CC3D_AVAILABLE = True
+except ImportError:
+    CC3D_AVAILABLE = False
+
+# pyvista wraps VTK's Flying Edges isosurfacer, which extracts the same
+# surface as marching cubes in three axis-aligned passes with less memory
+# traffic (1.5-2x faster even single-threaded). Optional - scikit-image
+# marching cubes is used when it isn't installed.
+try:
+    import pyvista as pv
+    PYVISTA_AVAILABLE = True
+except ImportError:
+    PYVISTA_AVAILABLE = False
+
+# numba compiles the porosity reduction into a parallel streaming kernel
+# with no bool temporary. Optional - numpy handles it when not installed.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def count_in_band(gyroid, thickness):
+        """Count voxels with |field| <= thickness, without materializing
+        the boolean solid mask."""
+        total = 0
+        for i in prange(gyroid.shape[0]):
+            sub = 0
+            for j in range(gyroid.shape[1]):
+                for l in range(gyroid.shape[2]):
+                    v = gyroid[i, j, l]
+                    if -thickness <= v <= thickness:
+                        sub += 1
+            total += sub
+        return total
+
+
+# Binary STL layout: 80-byte header, uint32 triangle count, then one
+# packed 50-byte record per triangle
+_STL_RECORD_DTYPE = np.dtype([('normal', '<3f4'),
+                              ('vertices', '<(3,3)f4'),
+                              ('attr', '<u2')])
+
+
+class GyroidMesh:
+    """
+    Triangle mesh with a direct binary STL writer.
+    
+    Replaces the numpy-stl Mesh here: normals are one vectorized
+    np.cross over all triangles and save() assembles the packed records
+    in a structured array written with a single tofile call, instead of
+    numpy-stl's per-triangle Python work.
+    """
+    
+    def __init__(self, vectors):
+        # (num_triangles, 3, 3) float32 triangle vertices
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    
+    def save(self, filename):
+        """Write the mesh to a binary STL file."""
+        tri = self.vectors
+        normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True) + 1e-12
+        
+        records = np.empty(len(tri), dtype=_STL_RECORD_DTYPE)
+        records['normal'] = normals
+        records['vertices'] = tri
+        records['attr'] = 0
+        
+        with open(filename, 'wb') as f:
+            f.write(b'Gyroid_Generator binary STL'.ljust(80, b'\0'))
+            f.write(np.uint32(len(tri)).tobytes())
+            records.tofile(f)
+
+
+def gyroid_field(x, y, z, k, out=None):
+    """
+    Evaluate the gyroid field sin(kx)cos(ky) + sin(ky)cos(kz) + sin(kz)cos(kx)
+    on the grid spanned by the 1D coordinate arrays x, y, z.
+    
+    The sin/cos terms only ever depend on one coordinate each, so they are
+    computed on the 1D axes (6 arrays of length N) and combined by
+    broadcasting. The old meshgrid version evaluated the transcendentals on
+    six full N^3 volumes - this does the same math with O(N) sin/cos calls
+    and no meshgrid allocation.
+    
+    Args:
+        x, y, z: 1D coordinate arrays
+        k: Gyroid wavenumber (2*pi*periods/size)
+        out: Optional preallocated (len(x), len(y), len(z)) output array.
+             When given, the field is accumulated into it in Z-slabs so
+             each slab's three adds run cache-resident and the volume is
+             written to DRAM exactly once.
+    
+    Returns:
+        3D gyroid field array of shape (len(x), len(y), len(z))
+    """
+    sx, cx = np.sin(k * x), np.cos(k * x)
+    sy, cy = np.sin(k * y), np.cos(k * y)
+    sz, cz = np.sin(k * z), np.cos(k * z)
+    
+    # Fast path: the field is exactly periodic with period 2*pi/k per
+    # axis. When the (uniform) sampling step divides that period, the
+    # whole volume is a tiling of one unit cell - evaluate the cell and
+    # tile it, replacing the per-voxel multiply-adds with copies.
+    nx, ny, nz = len(x), len(y), len(z)
+    if min(nx, ny, nz) > 1:
+        h = float(x[1] - x[0])
+        steps_per_period = 2.0 * np.pi / (float(k) * h) if h > 0 else 0.0
+        npc = int(round(steps_per_period))
+        if (npc >= 2 and abs(steps_per_period - npc) < 1e-6 * npc
+                and npc <= min(nx, ny, nz) // 2
+                and abs(float(y[1] - y[0]) - h) < 1e-9 * h
+                and abs(float(z[1] - z[0]) - h) < 1e-9 * h):
+            cell = (sx[:npc, None, None] * cy[None, :npc, None] +
+                    sy[None, :npc, None] * cz[None, None, :npc] +
+                    sz[None, None, :npc] * cx[:npc, None, None])
+            reps = (-(-nx // npc), -(-ny // npc), -(-nz // npc))
+            tiled = np.tile(cell, reps)[:nx, :ny, :nz]
+            if out is None:
+                return np.ascontiguousarray(tiled)
+            out[...] = tiled
+            return out
+    
+    if out is None:
+        return (sx[:, None, None] * cy[None, :, None] +
+                sy[None, :, None] * cz[None, None, :] +
+                sz[None, None, :] * cx[:, None, None])
+    
+    # Cache-blocked accumulation: each term is separable into a 2D table,
+    # so a Z-slab of the output takes three small broadcast adds that fit
+    # in L2 instead of three full-volume read-modify-write passes.
+    term_xy = sx[:, None] * cy[None, :]
+    term_yz = sy[:, None] * cz[None, :]
+    term_zx = cx[:, None] * sz[None, :]
+    slab = 16
+    for z0 in range(0, nz, slab):
+        zs = slice(z0, z0 + slab)
+        block = out[:, :, zs]
+        block[...] = term_xy[:, :, None]
+        block += term_yz[None, :, zs]
+        block += term_zx[:, None, zs]
+    return out
+
 
 def calculate_thickness_for_porosity(size, periods, resolution, target_porosity, 
-                                     tolerance=0.02, max_iterations=20):
+                                     tolerance=0.02, max_iterations=20,
+                                     calib_resolution=40, gyroid=None):
     """
     Calculate the thickness parameter needed to achieve target porosity.
     Uses binary search to find the right thickness value.
     
+    The search runs on a downsampled grid: porosity is a volume-fraction
+    statistic of a periodic field, so it converges at much lower resolution
+    than the meshing grid needs. Bisecting at calib_resolution=40 instead
+    of the full resolution cuts the calibration work by (R/40)^3 with no
+    practical loss in the recovered thickness.
+    
     Args:
         size: Cube size in mm
         periods: Number of unit cells
@@ -32,34 +189,44 @@ def calculate_thickness_for_porosity(size, periods, resolution, target_porosity,
         target_porosity: Desired porosity (0-1, e.g., 0.7 = 70%)
         tolerance: Acceptable error in porosity
         max_iterations: Maximum search iterations
+        calib_resolution: Grid resolution used for the bisection itself
+        gyroid: Optional precomputed gyroid field to bisect on. When the
+                caller already has the field in hand (create_watertight_gyroid
+                does), passing it here skips rebuilding it.
     
     Returns:
         thickness: The thickness parameter to use
     """
     print(f"Calculating thickness for {target_porosity*100:.1f}% porosity...")
     
-    # Create grid
-    x = np.linspace(0, size, resolution)
-    y = np.linspace(0, size, resolution)
-    z = np.linspace(0, size, resolution)
-    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
-    
-    # Compute gyroid
-    k = 2 * np.pi * periods / size
-    gyroid = (np.sin(k * X) * np.cos(k * Y) + 
-              np.sin(k * Y) * np.cos(k * Z) + 
-              np.sin(k * Z) * np.cos(k * X))
-    
-    # Binary search for thickness
+    if gyroid is None:
+        # Create grid (coarse - only the porosity statistic is needed here)
+        calib_res = min(calib_resolution, resolution)
+        x = np.linspace(0, size, calib_res, dtype=np.float32)
+        y = np.linspace(0, size, calib_res, dtype=np.float32)
+        z = np.linspace(0, size, calib_res, dtype=np.float32)
+        
+        # Compute gyroid
+        k = np.float32(2 * np.pi * periods / size)
+        gyroid = gyroid_field(x, y, z, k)
+    
+    # Binary search for thickness. The field never changes inside the
+    # loop - only the threshold does - so take |gyroid| once and each
+    # iteration is a single compare fused into a count, instead of two
+    # compares, an AND, and a bool temporary plus promotion-based sum.
+    abs_gyroid = None if NUMBA_AVAILABLE else np.abs(gyroid)
     thickness_min = 0.0
     thickness_max = 1.5
     
     for iteration in range(max_iterations):
         thickness = (thickness_min + thickness_max) / 2
         
-        # Create solid structure
-        solid = (gyroid >= -thickness) & (gyroid <= thickness)
-        volume_fraction = solid.sum() / solid.size
+        # Count voxels inside the walls
+        if NUMBA_AVAILABLE:
+            solid_count = count_in_band(gyroid, thickness)
+        else:
+            solid_count = np.count_nonzero(abs_gyroid <= thickness)
+        volume_fraction = solid_count / gyroid.size
         current_porosity = 1 - volume_fraction
         
         error = abs(current_porosity - target_porosity)
@@ -84,7 +251,8 @@ def calculate_thickness_for_porosity(size, periods, resolution, target_porosity,
     return thickness
 
 
-def calculate_porosity_for_thickness(size, periods, resolution, thickness):
+def calculate_porosity_for_thickness(size, periods, resolution, thickness,
+                                     gyroid=None):
     """
     Calculate the resulting porosity for a given thickness parameter.
     
@@ -93,27 +261,26 @@ def calculate_porosity_for_thickness(size, periods, resolution, thickness):
         periods: Number of unit cells
         resolution: Voxel resolution
         thickness: Wall thickness parameter
+        gyroid: Optional precomputed gyroid field to evaluate against
     
     Returns:
         porosity: Resulting porosity (0-1)
     """
     print(f"Calculating porosity for thickness={thickness:.3f}...")
     
-    # Create grid
-    x = np.linspace(0, size, resolution)
-    y = np.linspace(0, size, resolution)
-    z = np.linspace(0, size, resolution)
-    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
-    
-    # Compute gyroid
-    k = 2 * np.pi * periods / size
-    gyroid = (np.sin(k * X) * np.cos(k * Y) + 
-              np.sin(k * Y) * np.cos(k * Z) + 
-              np.sin(k * Z) * np.cos(k * X))
+    if gyroid is None:
+        # Create grid
+        x = np.linspace(0, size, resolution, dtype=np.float32)
+        y = np.linspace(0, size, resolution, dtype=np.float32)
+        z = np.linspace(0, size, resolution, dtype=np.float32)
+        
+        # Compute gyroid
+        k = np.float32(2 * np.pi * periods / size)
+        gyroid = gyroid_field(x, y, z, k)
     
     # Create solid structure
     solid = (gyroid >= -thickness) & (gyroid <= thickness)
-    volume_fraction = solid.sum() / solid.size
+    volume_fraction = np.count_nonzero(solid) / solid.size
     porosity = 1 - volume_fraction
     
     print(f"  ✓ Resulting porosity: {porosity*100:.1f}%")
@@ -134,7 +301,26 @@ def remove_floating_components(solid):
     """
     print("Removing floating components...")
     
-    # Label connected components
+    if CC3D_AVAILABLE:
+        # largest_k extracts the biggest blob directly, without keeping a
+        # full int32 label volume alive for components we are about to
+        # discard - roughly halves peak memory on the padded grid
+        cleaned = cc3d.largest_k(solid.view(np.uint8), k=1,
+                                 connectivity=26,
+                                 binary_image=True).astype(bool)
+        total_voxels = np.count_nonzero(solid)
+        largest_size = np.count_nonzero(cleaned)
+        removed_voxels = total_voxels - largest_size
+        
+        if removed_voxels == 0:
+            print("  ✓ No floating regions detected")
+            return solid
+        
+        print(f"  Largest component: {largest_size:,} voxels ({largest_size/total_voxels*100:.1f}% of total)")
+        print(f"  Removing floating region(s): {removed_voxels:,} voxels")
+        return cleaned
+    
+    # scipy fallback
     labeled, num_features = ndimage.label(solid)
     
     if num_features == 1:
@@ -143,19 +329,19 @@ def remove_floating_components(solid):
     
     print(f"  Found {num_features} components")
     
-    # Find largest component
-    component_sizes = [(i, (labeled == i).sum()) for i in range(1, num_features + 1)]
-    component_sizes.sort(key=lambda x: x[1], reverse=True)
-    
-    largest_label = component_sizes[0][0]
-    largest_size = component_sizes[0][1]
-    total_voxels = solid.sum()
+    # Find largest component - np.bincount sizes every component in one
+    # pass over the label volume, instead of a fresh full-volume mask and
+    # sum per component
+    component_sizes = np.bincount(labeled.ravel())
+    component_sizes[0] = 0  # background
+    largest_label = int(component_sizes.argmax())
+    largest_size = int(component_sizes[largest_label])
+    total_voxels = np.count_nonzero(solid)
     
     print(f"  Largest component: {largest_size:,} voxels ({largest_size/total_voxels*100:.1f}% of total)")
     
-    if num_features > 1:
-        removed_voxels = sum(size for _, size in component_sizes[1:])
-        print(f"  Removing {num_features-1} floating region(s): {removed_voxels:,} voxels")
+    removed_voxels = total_voxels - largest_size
+    print(f"  Removing {num_features-1} floating region(s): {removed_voxels:,} voxels")
     
     # Keep only largest component
     cleaned = (labeled == largest_label)
@@ -163,6 +349,76 @@ def remove_floating_components(solid):
     return cleaned
 
 
+def bitpack_closing(solid, iterations=2):
+    """
+    Binary closing (dilation then erosion, 6-connectivity cross) on a
+    bit-packed volume.
+    
+    ndimage.binary_closing sweeps a one-byte-per-voxel buffer four times
+    for iterations=2. Packing the Z axis into uint64 lanes lets each
+    shift/OR/AND handle 64 voxels per machine word, so the same closing
+    runs as a handful of bandwidth-bound passes over 1/8 the bytes.
+    Outside the volume counts as empty, matching scipy's border_value=0.
+    
+    Args:
+        solid: Boolean 3D array
+        iterations: Number of dilation (then erosion) passes
+    
+    Returns:
+        Boolean 3D array of the same shape
+    """
+    nx, ny, nz = solid.shape
+    lanes = (nz + 63) // 64
+    
+    packed = np.packbits(solid, axis=-1, bitorder='little')
+    byte_pad = lanes * 8 - packed.shape[-1]
+    if byte_pad:
+        packed = np.concatenate(
+            [packed, np.zeros((nx, ny, byte_pad), np.uint8)], axis=-1)
+    p = packed.view(np.uint64)
+    
+    one = np.uint64(1)
+    s63 = np.uint64(63)
+    # Bits past nz in the last lane are padding, not voxels - keep them
+    # cleared so they never feed back into the neighborhood ops
+    tail_bits = nz % 64
+    tail_mask = (one << np.uint64(tail_bits)) - one if tail_bits else ~np.uint64(0)
+    
+    def shift_neighbors(p):
+        # Voxel neighborhoods along Z, with carries across the 64-bit lanes
+        below = p << one
+        below[:, :, 1:] |= p[:, :, :-1] >> s63
+        above = p >> one
+        above[:, :, :-1] |= p[:, :, 1:] << s63
+        return below, above
+    
+    for _ in range(iterations):
+        below, above = shift_neighbors(p)
+        out = p | below | above
+        out[1:] |= p[:-1]
+        out[:-1] |= p[1:]
+        out[:, 1:] |= p[:, :-1]
+        out[:, :-1] |= p[:, 1:]
+        out[:, :, -1] &= tail_mask
+        p = out
+    
+    for _ in range(iterations):
+        below, above = shift_neighbors(p)
+        out = p & below & above
+        out[1:] &= p[:-1]
+        out[0] = 0
+        out[:-1] &= p[1:]
+        out[-1] = 0
+        out[:, 1:] &= p[:, :-1]
+        out[:, 0] = 0
+        out[:, :-1] &= p[:, 1:]
+        out[:, -1] = 0
+        p = out
+    
+    return np.unpackbits(p.view(np.uint8), axis=-1, bitorder='little',
+                         count=nz).view(np.bool_)
+
+
 def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3, 
                             resolution=100, remove_floaters=True, grading_ratio=1.0):
     """
@@ -183,7 +439,7 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
                        Only used if porosity is specified
     
     Returns:
-        numpy-stl Mesh object
+        GyroidMesh object (use .save(path) to write a binary STL)
     """
     
     print(f"="*70)
@@ -196,6 +452,31 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
     if grading_ratio != 1.0:
         print(f"  Grading:    {grading_ratio:.2f} (bottom/top thickness ratio)")
     
+    if porosity is None and thickness is None:
+        raise ValueError("Either porosity or thickness must be specified")
+    
+    # Add padding to ensure clean boundaries
+    padding = 3
+    res_padded = resolution + 2 * padding
+    pad_size = padding * size / resolution
+    
+    # Create grid (0 to size, with padding). float32 throughout: the only
+    # consumer is a >= threshold at ~1e-3 precision, and single precision
+    # halves the field's bandwidth and doubles SIMD width for the sin/cos.
+    x = np.linspace(-pad_size, size + pad_size, res_padded, dtype=np.float32)
+    y = np.linspace(-pad_size, size + pad_size, res_padded, dtype=np.float32)
+    z = np.linspace(-pad_size, size + pad_size, res_padded, dtype=np.float32)
+    
+    print("Computing gyroid surface...")
+    
+    # Gyroid equation: sin(x)cos(y) + sin(y)cos(z) + sin(z)cos(x) = t
+    # Computed once on the padded grid; the thickness/porosity calibration
+    # below reuses views of this field instead of rebuilding it.
+    k = np.float32(2 * np.pi * periods / size)
+    gyroid = np.empty((res_padded, res_padded, res_padded), dtype=np.float32)
+    gyroid_field(x, y, z, k, out=gyroid)
+    g_interior = gyroid[padding:-padding, padding:-padding, padding:-padding]
+    
     # Determine thickness (either calculate from porosity or use directly)
     if thickness is not None:
         # Thickness specified directly (no grading support with direct thickness)
@@ -205,18 +486,20 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
         print()
         # Calculate resulting porosity
         calculated_porosity = calculate_porosity_for_thickness(
-            size, periods, resolution, thickness
+            size, periods, resolution, thickness, gyroid=g_interior
         )
         print()
         thickness_bottom = thickness
         thickness_top = thickness
-        use_grading = False
     elif porosity is not None:
-        # Porosity specified, calculate thickness
+        # Porosity specified, calculate thickness. A strided view keeps the
+        # bisection reductions at calibration cost on the shared field.
         print(f"  Porosity:   {porosity*100:.1f}% (target)")
         print()
+        stride = max(1, resolution // 40)
         thickness_avg = calculate_thickness_for_porosity(
-            size, periods, resolution, porosity, tolerance=0.02
+            size, periods, resolution, porosity, tolerance=0.02,
+            gyroid=g_interior[::stride, ::stride, ::stride]
         )
         
         # Apply grading if ratio != 1.0
@@ -228,54 +511,44 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
             print(f"  Thickness (bottom): {thickness_bottom:.3f}")
             print(f"  Thickness (top):    {thickness_top:.3f}")
             print(f"  Gradient:           {(thickness_bottom-thickness_top)/size:.4f} per mm")
-            use_grading = True
         else:
             # Uniform thickness
             thickness_bottom = thickness_avg
             thickness_top = thickness_avg
             print(f"  Thickness:  {thickness_avg:.3f}")
-            use_grading = False
         print()
-    else:
-        raise ValueError("Either porosity or thickness must be specified")
     
-    # Add padding to ensure clean boundaries
-    padding = 3
-    res_padded = resolution + 2 * padding
-    pad_size = padding * size / resolution
-    
-    # Create grid (0 to size, with padding)
-    x = np.linspace(-pad_size, size + pad_size, res_padded)
-    y = np.linspace(-pad_size, size + pad_size, res_padded)
-    z = np.linspace(-pad_size, size + pad_size, res_padded)
-    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
-    
-    print("Computing gyroid surface...")
-    
-    # Gyroid equation: sin(x)cos(y) + sin(y)cos(z) + sin(z)cos(x) = t
-    k = 2 * np.pi * periods / size
-    gyroid = (np.sin(k * X) * np.cos(k * Y) + 
-              np.sin(k * Y) * np.cos(k * Z) + 
-              np.sin(k * Z) * np.cos(k * X))
-    
-    # Create solid structure
-    if use_grading:
-        # Spatially-varying thickness (linear grading in Z-direction)
-        z_normalized = np.clip((Z - 0) / size, 0, 1)
-        thickness_field = thickness_bottom + (thickness_top - thickness_bottom) * z_normalized
-        solid = (gyroid >= -thickness_field) & (gyroid <= thickness_field)
-    else:
-        # Uniform thickness
-        solid = (gyroid >= -thickness_bottom) & (gyroid <= thickness_bottom)
-    
-    # Mask to bounding box [0, size]³
-    mask = ((X >= 0) & (X <= size) & 
-            (Y >= 0) & (Y <= size) & 
-            (Z >= 0) & (Z <= size))
-    solid = solid & mask
+    # Create solid structure: |field| <= t(z), with the thickness profile
+    # linearly graded in Z (constant when grading_ratio is 1). Thresholding
+    # runs in Z-slabs into a preallocated bool volume, so the abs/compare
+    # temporaries stay slab-sized and cache-resident instead of two more
+    # full-volume bool buffers.
+    z_normalized = np.clip(z / size, 0, 1)
+    thickness_profile = (thickness_bottom
+                         + (thickness_top - thickness_bottom) * z_normalized
+                         ).astype(np.float32)
+    solid = np.empty(gyroid.shape, dtype=bool)
+    slab = 16
+    for z0 in range(0, res_padded, slab):
+        zs = slice(z0, z0 + slab)
+        np.less_equal(np.abs(gyroid[:, :, zs]),
+                      thickness_profile[None, None, zs],
+                      out=solid[:, :, zs])
+    
+    # Mask to bounding box [0, size]³. The grid is constructed so that
+    # exactly the central `resolution` indices per axis fall inside
+    # [0, size], so the mask is a fixed slice: clear the padding shells
+    # instead of testing every voxel against the bounds.
+    solid[:padding] = False
+    solid[-padding:] = False
+    solid[:, :padding] = False
+    solid[:, -padding:] = False
+    solid[:, :, :padding] = False
+    solid[:, :, -padding:] = False
+    interior_voxels = resolution ** 3
     
     # Calculate actual volume fraction
-    volume_fraction = solid.sum() / mask.sum()
+    volume_fraction = np.count_nonzero(solid) / interior_voxels
     actual_porosity = 1 - volume_fraction
     print(f"  Volume fraction: {volume_fraction:.1%}")
     print(f"  Actual porosity: {actual_porosity:.1%}")
@@ -286,7 +559,7 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
         solid = remove_floating_components(solid)
         
         # Recalculate porosity after removing floaters
-        volume_fraction_clean = solid.sum() / mask.sum()
+        volume_fraction_clean = np.count_nonzero(solid) / interior_voxels
         actual_porosity_clean = 1 - volume_fraction_clean
         print(f"  Final volume fraction: {volume_fraction_clean:.1%}")
         print(f"  Final porosity:        {actual_porosity_clean:.1%}")
@@ -294,27 +567,55 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
     
     # Close any small holes (makes mesh watertight)
     print("Closing holes to ensure watertight mesh...")
-    solid_closed = ndimage.binary_closing(solid, iterations=2)
+    solid_closed = bitpack_closing(solid, iterations=2)
     
     # Recalculate final porosity after closing
-    volume_fraction_final = solid_closed.sum() / mask.sum()
+    volume_fraction_final = np.count_nonzero(solid_closed) / interior_voxels
     actual_porosity_final = 1 - volume_fraction_final
     print(f"  Post-closing volume fraction: {volume_fraction_final:.1%}")
     print(f"  Post-closing porosity:        {actual_porosity_final:.1%}")
     print()
     
-    # Generate surface mesh using marching cubes
-    print("Generating surface mesh with marching cubes...")
+    # Generate the surface mesh
     # Use spacing that accounts for the actual grid including padding
     spacing = (size + 2 * pad_size) / res_padded
-    verts, faces, normals, values = measure.marching_cubes(
-        solid_closed.astype(float),
-        level=0.5,
-        spacing=(spacing, spacing, spacing)
-    )
     
-    # Shift vertices to account for padding (move origin to 0,0,0)
-    verts = verts - pad_size
+    if PYVISTA_AVAILABLE:
+        print("Generating surface mesh with flying edges...")
+        grid = pv.ImageData(dimensions=solid_closed.shape,
+                            spacing=(spacing, spacing, spacing),
+                            origin=(-pad_size, -pad_size, -pad_size))
+        # VTK expects x-fastest point ordering, i.e. Fortran raveling of
+        # the (x, y, z)-indexed volume
+        grid.point_data['solid'] = solid_closed.ravel(order='F').astype(np.float32)
+        surf = grid.contour([0.5], scalars='solid', method='flying_edges')
+        verts = np.asarray(surf.points)
+        faces = np.asarray(surf.faces).reshape(-1, 4)[:, 1:]
+    else:
+        print("Generating surface mesh with marching cubes...")
+        # The surface only exists where the field magnitude is near the
+        # threshold (including the box-face cuts, where both sides of the
+        # cut sit inside the walls). Restricting marching cubes to that
+        # narrow band skips the majority of cells. The margin covers the
+        # worst-case field change across the 2-voxel closing plus the
+        # cell stencil.
+        t_max = max(thickness_bottom, thickness_top)
+        band_margin = 3 * np.sqrt(3) * k * spacing
+        band = np.abs(gyroid) <= t_max + band_margin
+        
+        # view(np.uint8) reinterprets the bool buffer in place - no
+        # float64 promotion copy of the padded volume just to compare
+        # against 0.5
+        verts, faces, normals, values = measure.marching_cubes(
+            solid_closed.view(np.uint8),
+            level=0.5,
+            spacing=(spacing, spacing, spacing),
+            mask=band
+        )
+        
+        # Shift vertices to account for padding (move origin to 0,0,0);
+        # the flying-edges path bakes this into the grid origin
+        verts = verts - pad_size
     
     # Clip vertices to ensure they're exactly in [0, size] range
     # This is critical for Gmsh to properly create volume mesh
@@ -323,19 +624,20 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
     print(f"  Vertices:  {len(verts):,}")
     print(f"  Triangles: {len(faces):,}")
     
-    # Create STL mesh
+    # Create STL mesh - one fancy-indexed gather instead of a Python loop
+    # over every triangle
     print("Creating STL mesh...")
-    stl_mesh = mesh_stl.Mesh(np.zeros(faces.shape[0], dtype=mesh_stl.Mesh.dtype))
-    for i, face in enumerate(faces):
-        for j in range(3):
-            stl_mesh.vectors[i][j] = verts[face[j]]
+    tri = verts[faces].astype(np.float32)
     
-    # Update normals
-    stl_mesh.update_normals()
-    
-    # Check mesh properties
+    # Check mesh properties. Signed volume and centroid come from the
+    # divergence theorem over origin-apex tetrahedra - all vectorized,
+    # replacing numpy-stl's per-triangle get_mass_properties loop.
     print("Checking mesh quality...")
-    volume, cog, inertia = stl_mesh.get_mass_properties()
+    tet_volumes = np.einsum('ij,ij->i', tri[:, 0],
+                            np.cross(tri[:, 1], tri[:, 2])) / 6.0
+    volume = float(tet_volumes.sum())
+    cog = ((tet_volumes[:, None] * tri.sum(axis=1)).sum(axis=0)
+           / (4.0 * volume))
     
     print(f"  Volume:  {abs(volume):.2f} mm³")
     print(f"  Center:  [{cog[0]:.2f}, {cog[1]:.2f}, {cog[2]:.2f}]")
@@ -343,19 +645,20 @@ def create_watertight_gyroid(size=25, porosity=None, thickness=None, periods=3,
     # Fix inverted normals if needed
     if volume < 0:
         print("  Fixing inverted normals...")
-        stl_mesh.vectors = stl_mesh.vectors[:, ::-1, :]
+        tri = tri[:, ::-1, :]
         volume = -volume
     
-    # Check if watertight
-    edges = {}
-    for triangle in stl_mesh.vectors:
-        for i in range(3):
-            p1 = tuple(np.round(triangle[i], 6))
-            p2 = tuple(np.round(triangle[(i+1)%3], 6))
-            edge = tuple(sorted([p1, p2]))
-            edges[edge] = edges.get(edge, 0) + 1
-    
-    boundary_edges = sum(1 for count in edges.values() if count != 2)
+    stl_mesh = GyroidMesh(tri)
+    
+    # Check if watertight: every edge of a closed 2-manifold is shared by
+    # exactly two triangles. Working on the vertex-index faces array keeps
+    # the whole audit in vectorized numpy (the old version pushed 3 sorted
+    # coordinate-tuple keys per triangle through a Python dict).
+    edge_list = np.concatenate((faces[:, [0, 1]], faces[:, [1, 2]],
+                                faces[:, [2, 0]]))
+    edge_list = np.sort(edge_list, axis=1)
+    uniq, counts = np.unique(edge_list, axis=0, return_counts=True)
+    boundary_edges = int(np.count_nonzero(counts != 2))
     
     if boundary_edges == 0:
         print("  ✓ Mesh is WATERTIGHT!")
@@ -2,7 +2,7 @@ import numpy as np
 from scipy.stats import qmc
 
 #Define Materials bounds 
-POROSITY_MIN = 20
+POROSITY_MIN = 0.20
 POROSITY_MAX = 0.85
 
 PERIODS_MIN = 1
@@ -33,19 +33,17 @@ def generate_lhs_designs(
 
     scaled = qmc.scale(unit_samples, l_bounds, u_bounds)
 
-    #Round periods to intergers
-    periods_int = np.round(scaled[:,1]).astype(int)
-
-    #Make input arrays
-    designs = []
-    for i in range(num_samples):
-        d = {
-        "porosity": float(scaled[i,0]),
-        "periods": int(periods_int[i]),
-        "grading": float(scaled[i,2])
-        }
-        designs.append(d)
-
-        return designs
+    #Structure-of-arrays result: one structured ndarray instead of a list
+    #of per-design dicts - vectorizes the periods rounding and keeps rows
+    #addressable by field name downstream. Also fixes the early return
+    #that cut the output to a single design.
+    designs = np.empty(num_samples, dtype=[("porosity", "f8"),
+                                           ("periods", "i4"),
+                                           ("grading", "f8")])
+    designs["porosity"] = scaled[:, 0]
+    designs["periods"] = np.round(scaled[:, 1]).astype(np.int32)
+    designs["grading"] = scaled[:, 2]
+
+    return designs
     
     
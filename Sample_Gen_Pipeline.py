@@ -1,5 +1,6 @@
 import subprocess
 from pathlib import Path 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 from scipy.stats import qmc
 import trimesh
@@ -8,8 +9,10 @@ from scipy.stats import qmc
 import os
 import csv
 
+from Gyroid_Generator import create_watertight_gyroid
+
 #Define Materials bounds 
-POROSITY_MIN = 20
+POROSITY_MIN = 0.20
 POROSITY_MAX = 0.85
 
 PERIODS_MIN = 1
@@ -40,37 +43,35 @@ def generate_lhs_designs(
 
     scaled = qmc.scale(unit_samples, l_bounds, u_bounds)
 
-    #Round periods to intergers
-    periods_int = np.round(scaled[:,1]).astype(int)
-
-    #Make input arrays
-    designs = []
-    for i in range(num_samples):
-        d = {
-        "porosity": float(scaled[i,0]),
-        "periods": int(periods_int[i]),
-        "grading": float(scaled[i,2])
-        }
-        designs.append(d)
-
-        return designs
+    #Structure-of-arrays result: one structured ndarray instead of a list
+    #of per-design dicts - vectorizes the periods rounding and keeps rows
+    #addressable by field name downstream. Also fixes the early return
+    #that cut the output to a single design.
+    designs = np.empty(num_samples, dtype=[("porosity", "f8"),
+                                           ("periods", "i4"),
+                                           ("grading", "f8")])
+    designs["porosity"] = scaled[:, 0]
+    designs["periods"] = np.round(scaled[:, 1]).astype(np.int32)
+    designs["grading"] = scaled[:, 2]
+
+    return designs
     
     
 
 
 def generate_stl(design, run_dir, cube_size=25.0):
+    #In-process call: the subprocess version paid python + numpy startup
+    #(~1 s) per design, and also fed the CLI a porosity fraction where it
+    #expects a percentage
     stl_path = Path(run_dir) / "part.stl"
 
-    command = [
-        "python",
-        "gyroid_generator.py",
-        "--porosity", str(design["porosity"]),
-        "--grading-ratio", str(design["grading"]),
-        "--periods", str(design["periods"]),
-        "--output", str(stl_path),
-    ]
-
-    subprocess.run(command, check=True)
+    gyroid_mesh = create_watertight_gyroid(
+        size=cube_size,
+        porosity=float(design["porosity"]),
+        periods=int(design["periods"]),
+        grading_ratio=float(design["grading"]),
+    )
+    gyroid_mesh.save(str(stl_path))
 
     return stl_path 
 
@@ -288,16 +289,36 @@ def main():
     NUM_SAMPLES = 200
     GLOBAL_CSV = "global_results.csv"
 
-    designs = generate_lhs_designs(num_smaples = NUM_SAMPLES)
+    designs = generate_lhs_designs(
+        NUM_SAMPLES,
+        porosity_range=(POROSITY_MIN, POROSITY_MAX),
+        periods_range=(PERIODS_MIN, PERIODS_MAX),
+        grading_range=(GRADING_MIN, GRADING_MAX),
+    )
 
     Path("dataset").mkdir(exist_ok=True)
 
-    for i, design in enumerate(designs):
-        run_dir = Path("dataset") / f"run_{i:o4d}"
+    run_dirs = []
+    for i in range(len(designs)):
+        run_dir = Path("dataset") / f"run_{i:04d}"
         run_dir.mkdir(parents=True, exist_ok=True)
+        run_dirs.append(run_dir)
+
+    #Generate all STLs in parallel - designs are independent and the
+    #generator is single-threaded numpy. Meshing and MOOSE stay serial
+    #below since they use all cores themselves.
+    stl_paths = {}
+    with ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2)) as executor:
+        futures = {
+            executor.submit(generate_stl, design, run_dir): i
+            for i, (design, run_dir) in enumerate(zip(designs, run_dirs))
+        }
+        for future in as_completed(futures):
+            stl_paths[futures[future]] = future.result()
 
-        #Generate STL:
-        stl_path = generate_stl(design, run_dir)
+    for i, design in enumerate(designs):
+        run_dir = run_dirs[i]
+        stl_path = stl_paths[i]
 
         #Feasability Check
         feasible, rho_star, rho_slice_min, rho_slice_max, note = feasability_filter(
@@ -333,13 +354,13 @@ def main():
 
         if not success:
             append_result_row(
-            GLOBAL_CSV,
-            design,
-            rho_star,
-            converged=False,
-            note="moose_fail"
-        )
-        continue
+                GLOBAL_CSV,
+                design,
+                rho_star,
+                converged=False,
+                note="moose_fail"
+            )
+            continue
 
         out_csv_path = run_dir / "out.csv"
         Fz_top, k_eff, E_eff = parse_moose_csv(out_csv_path)